@@ -20,6 +20,13 @@ setuptools.setup(
     },
     install_requires=[
         'requests>=2.21.0',
-        'ratelimiter>=1.2.0',
-    ]
+        'urllib3>=1.26.0',
+    ],
+    extras_require={
+        'async': ['aiohttp>=3.7.0'],
+        'diskcache': ['diskcache>=5.0.0'],
+        'http2': ['httpx[http2]>=0.18.0'],
+        'orjson': ['orjson>=3.0.0'],
+        'stream': ['ijson>=3.1.0'],
+    }
 )
@@ -1,8 +1,41 @@
+import asyncio
 import base64
+import collections
+import concurrent.futures
+import inspect
 import json
+import os
+import threading
+import time
 
 import requests
-import ratelimiter
+import requests.adapters
+import urllib3.util
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 # Exceptions
@@ -27,12 +60,201 @@ class UnknownError(WyscoutAPIError):
     pass
 
 
+# Rate limiting
+
+class TokenBucket:
+    """
+    A thread-safe token bucket rate limiter.
+
+    Tokens are refilled continuously at `rate` tokens per second, up to a maximum
+    of `capacity`. Each call consumes `cost` tokens, blocking until enough are
+    available.
+    """
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'last', '_lock')
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cost=1.0):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+
+            if self.tokens < cost:
+                time.sleep((cost - self.tokens) / self.rate)
+                self.tokens = 0
+                self.last = time.monotonic()
+            else:
+                self.tokens -= cost
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+class AsyncTokenBucket:
+    """
+    An asyncio token bucket rate limiter.
+
+    As `TokenBucket`, but waits without blocking the event loop, so that it can
+    be shared between many concurrent coroutines.
+    """
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'last', '_lock')
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = None
+        self._lock = None
+
+    async def acquire(self, cost=1.0):
+        # The lock is created on first use, since before Python 3.10 an asyncio.Lock
+        # is bound to the event loop current when it is created, and the bucket may
+        # be created outside the loop it's used in
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            if self.last is not None:
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+
+            if self.tokens < cost:
+                await asyncio.sleep((cost - self.tokens) / self.rate)
+                self.tokens = 0
+                self.last = loop.time()
+            else:
+                self.tokens -= cost
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+
+# Caching
+
+class TTLCache:
+    """
+    A thread-safe, in-memory LRU cache whose entries expire after `ttl` seconds.
+    """
+
+    __slots__ = ('maxsize', 'ttl', '_data', '_lock')
+
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                expires, value = self._data[key]
+            except KeyError:
+                return default
+
+            if expires < time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+def _open_disk_cache(directory):
+    if directory is None:
+        return None
+    if diskcache is None:
+        raise ImportError('A disk cache requires diskcache (pip install wyscoutapi[diskcache])')
+    return diskcache.Cache(os.path.expanduser(directory))
+
+
 # Loaders
 
-class WyscoutAPILoader:
+_BOOL_STR = {True: 'true', False: 'false'}
+
+
+def _encode_params(params):
+    """ Drop unset (None) params, and convert bools to their JSON representation. """
+    return {
+        param: _BOOL_STR[val] if isinstance(val, bool) else val
+        for param, val in params.items()
+        if val is not None
+    }
+
+
+def _basic_auth_header(username, password):
+    token = base64.b64encode(f'{username}:{password}'.encode()).decode('ascii')
+    return {'Authorization': f'Basic {token}'}
+
+
+_DAY = 24 * 60 * 60
+
+
+class _BaseWyscoutAPILoader:
+    __slots__ = ('username', 'version', '_url_prefix', 'rate_limiter', '_cache')
+
     BASE_URL = 'https://apirest.wyscout.com'
 
-    def __init__(self, username, password, version='v3', requests_per_sec=12):
+    # Caching policy, keyed by route template (see `_route_template`).
+    # Near-static reference data is cached in memory:
+    _CACHED_ROUTES = frozenset({
+        ('areas',),
+        ('coaches', '{}'),
+        ('referees', '{}'),
+        ('rounds', '{}'),
+    })
+
+    # Rarely-changing resources are persisted to the disk cache (where one is
+    # configured) for the given number of seconds, or forever if None:
+    _CACHE_TTL = {
+        ('areas',): None,
+        ('competitions', '{}'): 30 * _DAY,
+        ('competitions', '{}', 'seasons'): _DAY,
+        ('rounds', '{}'): 30 * _DAY,
+        ('seasons', '{}'): 30 * _DAY,
+        # Events for recent matches are still revised after full time
+        ('matches', '{}', 'events'): _DAY,
+    }
+
+    # Parse the raw response bytes directly (skipping a separate decode to str),
+    # using orjson where it's available
+    _loads = staticmethod(orjson.loads if orjson else json.loads)
+
+    _ERRORS = {
+        400: BadRequestError,
+        401: AuthenticationError,
+        429: TooManyRequestsError,
+    }
+
+    def __init__(self, username, rate_limiter, version='v3', cache_size=1024, cache_ttl=300):
         # Saving username and password as attributes is not necessary
         # It may occassionally be useful to view the username,
         # But we don't want password to be viewable as a plaintext attribute to minimise
@@ -41,240 +263,694 @@ class WyscoutAPILoader:
         self.username = username
 
         self.version = version
-        self.rate_limiter = ratelimiter.RateLimiter(max_calls=requests_per_sec, period=1)
+        self._url_prefix = f'{self.BASE_URL}/{version}/'
+        self.rate_limiter = rate_limiter
+        self._cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+
+    def cache_clear(self):
+        self._cache.clear()
+
+    @staticmethod
+    def _route_template(route):
+        # Routes take the form resource[/id[/subresource]]
+        return tuple('{}' if i == 1 else seg for i, seg in enumerate(route))
+
+    def _cache_key(self, route, params):
+        # Built from the encoded params, with sequences as tuples. Returns None when a
+        # param can't be hashed, in which case the response isn't cached.
+        # The key covers the base URL, version and account, since accounts can have
+        # access to different data, and a disk cache directory may be shared
+        key = (self._url_prefix, self.username, route, tuple(sorted(
+            (param, tuple(val) if isinstance(val, (list, tuple)) else val)
+            for param, val in params.items()
+        )))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _url(self, *route):
+        return self._url_prefix + '/'.join(map(str, route))
+
+    def _parse_content(self, content):
+        if not isinstance(content, dict):
+            # API call returned a list
+            return content
+
+        error = content.get('error')
+        if not error:
+            return content
+
+        if isinstance(error, str):
+            raise UnknownError(error)
+        raise self._ERRORS.get(error['code'], UnknownError)(error['message'])
+
+    def _parse_response(self, status, raw):
+        if not 200 <= status < 300:
+            # Prefer the API's own error where there is one, but never return
+            # (or cache) a non-2xx body, even if it parses without an error key
+            try:
+                content = self._loads(raw)
+            except ValueError:
+                content = None
+            self._parse_content(content)
+            raise UnknownError(f'Unexpected response status {status}')
+
+        return self._parse_content(self._loads(raw))
+
+
+class _BaseSyncWyscoutAPILoader(_BaseWyscoutAPILoader):
+    """
+    Caching, rate-limiting and parsing shared by the synchronous loaders.
+
+    Subclasses implement `_fetch(route, params) -> (status, raw bytes)`,
+    `_head(route)` and `_close_transport()`.
+    """
+
+    __slots__ = ('_disk_cache',)
 
-        auth = base64.b64encode(f'{username}:{password}'.encode())
-        self.headers = {'Authorization': 'Basic {auth}'.format(auth=auth.decode())}
+    _TRANSPORT_ERRORS = ()
 
-    def _url(self, *route, **params):
-        return '{base}/{version}/{route}'.format(
-            base=self.BASE_URL,
-            version=self.version,
-            route='/'.join(str(r) for r in route)
+    def __init__(self, username, version='v3', requests_per_sec=12,
+                 cache_size=1024, cache_ttl=300, disk_cache_dir=None):
+        super().__init__(
+            username=username,
+            rate_limiter=TokenBucket(rate=requests_per_sec, capacity=requests_per_sec),
+            version=version,
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
         )
+        self._disk_cache = _open_disk_cache(disk_cache_dir)
 
-    def _parse_response(self, response):
-        content = response.json()
+    def _warm(self):
+        # Warming the connection is best-effort, so any failure is left for the first
+        # real call to surface
         try:
-            error = content.get('error', None)
-        except AttributeError:
-            # API call returned a list
-            return content
+            with self.rate_limiter:
+                self._head(('areas',))
+        except self._TRANSPORT_ERRORS:
+            pass
 
-        if error:
-            if isinstance(error, str):
-                raise UnknownError(error)
-            if error['code'] == 401:
-                raise AuthenticationError(error['message'])
-            elif error['code'] == 400:
-                raise BadRequestError(error['message'])
-            elif error['code'] == 429:
-                raise TooManyRequestsError(error['message'])
-            else:
-                raise UnknownError(error['message'])
+    def close(self):
+        self._close_transport()
+        if self._disk_cache is not None:
+            self._disk_cache.close()
 
-        return content
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _disk_get(self, key):
+        if self._disk_cache is None:
+            return None
+        return self._disk_cache.get(key)
+
+    def _disk_set(self, key, raw, ttl):
+        if self._disk_cache is not None:
+            self._disk_cache.set(key, raw, expire=ttl)
 
     def get_route_json(self, *route, **params):
-        for param, val in params.items():
-            if isinstance(param, bool):
-                params[param] = json.dumps(val)  # So that True -> 'true'
+        # Cached responses are returned without consuming a rate-limit token.
+        # Both caches hold the raw response bytes, which are parsed afresh on each
+        # hit, so that callers never share (and can't mutate) a cached object
+        params = _encode_params(params)
+        template = self._route_template(route)
+        cache = template in self._CACHED_ROUTES
+        persist = template in self._CACHE_TTL and self._disk_cache is not None
+        key = self._cache_key(route, params) if cache or persist else None
+        if key is None:
+            cache = persist = False
+
+        raw = self._cache.get(key) if cache else None
+        if raw is None and persist:
+            raw = self._disk_get(key)
+            if raw is not None and cache:
+                self._cache.set(key, raw)
+        if raw is not None:
+            return self._loads(raw)
 
         with self.rate_limiter:
-            r = requests.get(self._url(*route), headers=self.headers, params=params)
+            status, raw = self._fetch(route, params)
 
-        return self._parse_response(r)
+        # Raises for unsuccessful responses, so that only successful ones are cached
+        content = self._parse_response(status, raw)
+        if persist:
+            self._disk_set(key, raw, self._CACHE_TTL[template])
+        if cache:
+            self._cache.set(key, raw)
 
+        return content
 
-# API Client
 
-class APIClient:
+class _BaseAsyncWyscoutAPILoader(_BaseWyscoutAPILoader):
     """
-    A wrapper for the Wyscout football data API v2 & v3
+    Caching, rate-limiting and parsing shared by the asyncio loaders.
+
+    Subclasses implement `async _fetch(route, params) -> (status, raw bytes)`
+    and `async _close_transport()`.
     """
 
-    def __init__(self, loader):
-        self.loader = loader
+    __slots__ = ()
 
-    # Areas
+    def __init__(self, username, version='v3', requests_per_sec=12,
+                 cache_size=1024, cache_ttl=300):
+        super().__init__(
+            username=username,
+            rate_limiter=AsyncTokenBucket(rate=requests_per_sec, capacity=requests_per_sec),
+            version=version,
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
+        )
 
-    def areas(self, details=None, fetch=None):
-        return self.loader.get_route_json('areas', details=details, fetch=fetch)
+    async def close(self):
+        await self._close_transport()
 
-    # Coaches
+    async def __aenter__(self):
+        return self
 
-    def coach(self, coach_id, details=None, fetch=None):
-        """ Retrieves information about a given coach. """
-        return self.loader.get_route_json('coaches', coach_id, details=details, fetch=fetch)
+    async def __aexit__(self, *exc_info):
+        await self.close()
 
-    # Competitions
+    async def get_route_json(self, *route, **params):
+        # Persisting to disk is not supported, since it would block the event loop
+        params = _encode_params(params)
+        key = self._cache_key(route, params) if self._route_template(route) in self._CACHED_ROUTES else None
+        if key is not None:
+            raw = self._cache.get(key)
+            if raw is not None:
+                return self._loads(raw)
 
-    def competitions(self, area_id, details=None, fetch=None):
-        """ Returns a list of competitions for a given area. """
-        return self.loader.get_route_json('competitions', areaId=area_id, details=details, fetch=fetch)
+        await self.rate_limiter.acquire()
+        status, raw = await self._fetch(route, params)
 
-    def competition(self, competition_id, details=None, fetch=None):
-        """ Retrieves information about a given competition. """
-        return self.loader.get_route_json('competitions', competition_id, details=details, fetch=fetch)
+        content = self._parse_response(status, raw)
+        if key is not None:
+            self._cache.set(key, raw)
 
-    def competition_seasons(self, competition_id, active=False, details=None, fetch=None):
-        """ Returns the list of seasons of the given competition. """
-        return self.loader.get_route_json('competitions', competition_id, 'seasons', active=active, details=details, fetch=fetch)
+        return content
 
-    def competition_matches(self, competition_id, details=None, fetch=None):
-        """ Returns the list of matches of the given competition in the current season. """
-        return self.loader.get_route_json('competitions', competition_id, 'matches', details=details, fetch=fetch)
 
-    def competition_players(self, competition_id, details=None, fetch=None):
-        """ Returns the list of players of the given competition in the current season. """
-        return self.loader.get_route_json('competitions', competition_id, 'players', details=details, fetch=fetch)
+class WyscoutAPILoader(_BaseSyncWyscoutAPILoader):
+    """
+    A loader backed by a persistent requests session.
 
-    def competition_teams(self, competition_id, details=None, fetch=None):
-        """ Returns the list of teams of the given competition in the current season. """
-        return self.loader.get_route_json('competitions', competition_id, 'teams', details=details, fetch=fetch)
+    Server errors (500, 502, 503 and 504) are retried up to 5 times with an
+    exponential backoff, so in the worst case a call takes 6 attempts and about
+    15 seconds of waiting before raising (longer if a 503 carries a Retry-After
+    header). Rate-limited (429) responses are not retried, and raise
+    TooManyRequestsError straight away.
 
-    # Matches
+    If `warm` is set, a single HEAD request is made on creation, so that the first
+    API call is made over an already-established connection.
+    """
 
-    def match(self, match_id, use_sides=False, details=None, fetch=None):
-        """ Retrieves information about a given match. """
-        return self.loader.get_route_json('matches', match_id, useSides=use_sides, details=details, fetch=fetch)
+    __slots__ = ('session',)
 
-    # Players
+    _TRANSPORT_ERRORS = (requests.RequestException,)
 
-    def player(self, player_id, image_data_url=False, details=None, fetch=None):
-        """ Retrieves information about a given player. """
-        return self.loader.get_route_json('players', player_id, imageDataURL=image_data_url, details=details, fetch=fetch)
+    def __init__(self, username, password, version='v3', requests_per_sec=12,
+                 cache_size=1024, cache_ttl=300, disk_cache_dir=None, warm=False):
+        super().__init__(
+            username=username,
+            version=version,
+            requests_per_sec=requests_per_sec,
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
+            disk_cache_dir=disk_cache_dir,
+        )
 
-    def player_career(self, player_id, details=None, fetch=None):
-        """ Retrieves aggregated career information about a given player. """
-        return self.loader.get_route_json('players', player_id, 'career', details=details, fetch=fetch)
+        # Reuse a single session so that consecutive calls share a keep-alive
+        # connection, instead of paying for a new TCP/TLS handshake each time
+        self.session = requests.Session()
+
+        # Size the connection pool to the rate limit, so that bursts of calls
+        # don't fall back to opening (and discarding) unpooled connections.
+        # Server errors are retried with a backoff; once the retries are exhausted,
+        # the final response is passed through so that `get_route_json` can raise
+        # the appropriate WyscoutAPIError. 429s aren't retried here, since these
+        # retries happen within a single rate-limiter token, and so would send
+        # requests faster than the configured rate
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=requests_per_sec,
+            pool_maxsize=requests_per_sec * 2,
+            pool_block=False,
+            max_retries=urllib3.util.Retry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=[500, 502, 503, 504],
+                allowed_methods=['GET'],
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
 
-    def player_transfer(self, player_id, details=None, fetch=None):
-        """ Retrieves a given player's transfers. """
-        return self.loader.get_route_json('players', player_id, 'transfer', details=details, fetch=fetch)
+        # Set once on the session, rather than being merged into every request
+        self.session.headers.update(_basic_auth_header(username, password))
 
-    def player_matches(self, player_id, details=None, fetch=None):
-        """ Returns the list of matches played by the given player in the current season. """
-        return self.loader.get_route_json('players', player_id, 'matches', details=details, fetch=fetch)
+        if warm:
+            self._warm()
 
-    def player_fixtures(self, player_id, details=None, fetch=None):
-        """ Retrieves all the fixtures matches for the given player. """
-        return self.loader.get_route_json('players', player_id, 'fixtures', details=details, fetch=fetch)
+    def _fetch(self, route, params):
+        r = self.session.get(self._url(*route), params=params)
+        return r.status_code, r.content
 
-    # Referees
+    def _head(self, route):
+        self.session.head(self._url(*route), timeout=5)
 
-    def referee(self, referee_id, details=None, fetch=None):
-        """ Retrieves informations about a given referee. """
-        return self.loader.get_route_json('referees', referee_id, details=details, fetch=fetch)
+    def _close_transport(self):
+        self.session.close()
 
-    # Rounds
+    def get_route_json_stream(self, *route, prefix='item', **params):
+        """
+        Lazily yield the items found at `prefix` (an ijson prefix, such as
+        'events.item') as the response is downloaded, without loading the whole
+        response into memory.
+        """
+        if ijson is None:
+            raise ImportError('Streaming responses requires ijson (pip install wyscoutapi[stream])')
 
-    def round(self, round_id, details=None, fetch=None):
-        """ Retrieves information about a given round. """
-        return self.loader.get_route_json('rounds', round_id, details=details, fetch=fetch)
+        with self.rate_limiter:
+            r = self.session.get(self._url(*route), params=_encode_params(params), stream=True)
 
-    # Search
+        with r:
+            if not 200 <= r.status_code < 300:
+                # Errors are small, so can be read in full
+                self._parse_response(r.status_code, r.content)
 
-    def search(self, query, object_type, details=None, fetch=None):
-        """
-        Returns a list of objects, matching the provided search string.
+            r.raw.decode_content = True
+            yield from ijson.items(r.raw, prefix, use_float=True)
 
-        For example:
-        >>> w = WyscoutAPI()
-        >>> w.search('totti', 'player')
-        """
-        return self.loader.get_route_json('search', query=query, objType=object_type, details=details, fetch=fetch)
 
-    # Seasons
+class AsyncWyscoutAPILoader(_BaseAsyncWyscoutAPILoader):
+    """
+    An asyncio loader, backed by an aiohttp session shared between all calls.
 
-    def season(self, season_id, details=None, fetch=None):
-        """ Retrieves information about a given season. """
-        return self.loader.get_route_json('seasons', season_id, details=details, fetch=fetch)
+    The loader should be created (and closed) from within a running event loop.
+    """
 
-    def season_career(self, season_id, filters=None, details=None, fetch=None):
-        """ Retrieves all the team's information for the given season. """
-        return self.loader.get_route_json('seasons', season_id, 'career', filters=filters or {}, details=details, fetch=fetch)
+    __slots__ = ('session',)
 
-    def season_matches(self, season_id, details=None, fetch=None):
-        """ Returns the list of matches played in the given season. """
-        return self.loader.get_route_json('seasons', season_id, 'matches', details=details, fetch=fetch)
+    def __init__(self, username, password, version='v3', requests_per_sec=12,
+                 cache_size=1024, cache_ttl=300):
+        if aiohttp is None:
+            raise ImportError(
+                'AsyncWyscoutAPILoader requires aiohttp (pip install wyscoutapi[async])'
+            )
 
-    def season_fixtures(self, season_id, details=None, fetch=None):
-        """ Retrieves all the matches for the given season. """
-        return self.loader.get_route_json('seasons', season_id, 'fixtures', details=details, fetch=fetch)
+        super().__init__(
+            username=username,
+            version=version,
+            requests_per_sec=requests_per_sec,
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
+        )
 
-    def season_players(self, season_id, details=None, fetch=None):
-        """ Returns the list of players in the given season. """
-        return self.loader.get_route_json('seasons', season_id, 'players', details=details, fetch=fetch)
+        self.session = aiohttp.ClientSession(
+            headers=_basic_auth_header(username, password),
+            connector=aiohttp.TCPConnector(limit=requests_per_sec),
+        )
 
-    def season_teams(self, season_id, details=None, fetch=None):
-        """ Returns the list of teams in the given season. """
-        return self.loader.get_route_json('seasons', season_id, 'teams', details=details, fetch=fetch)
+    async def _fetch(self, route, params):
+        async with self.session.get(self._url(*route), params=params) as r:
+            return r.status, await r.read()
 
-    def season_standings(self, season_id, details=None, fetch=None):
-        """ Retrieves all the standing's information for the given season. """
-        return self.loader.get_route_json('seasons', season_id, 'standings', details=details, fetch=fetch)
+    async def _close_transport(self):
+        await self.session.close()
 
-    # Teams
 
-    def team(self, team_id, image_data_url=False, details=None, fetch=None):
-        """ Retrieves informations about a given team. """
-        return self.loader.get_route_json('teams', team_id, imageDataURL=image_data_url, details=details, fetch=fetch)
+class HttpxWyscoutAPILoader(_BaseSyncWyscoutAPILoader):
+    """
+    A loader backed by an HTTP/2 httpx client, so that concurrent calls (e.g.
+    from several threads) are multiplexed over a single connection.
+
+    If `warm` is set, a single HEAD request is made on creation, so that the first
+    API call is made over an already-negotiated connection.
+    """
+
+    __slots__ = ('client',)
+
+    _TRANSPORT_ERRORS = (httpx.HTTPError,) if httpx else ()
+
+    def __init__(self, username, password, version='v3', requests_per_sec=12,
+                 cache_size=1024, cache_ttl=300, disk_cache_dir=None, warm=False):
+        if httpx is None:
+            raise ImportError(
+                'HttpxWyscoutAPILoader requires httpx (pip install wyscoutapi[http2])'
+            )
+
+        super().__init__(
+            username=username,
+            version=version,
+            requests_per_sec=requests_per_sec,
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
+            disk_cache_dir=disk_cache_dir,
+        )
+
+        self.client = httpx.Client(
+            http2=True,
+            base_url=self._url_prefix,
+            headers=_basic_auth_header(username, password),
+        )
+
+        if warm:
+            self._warm()
+
+    def _fetch(self, route, params):
+        r = self.client.get('/'.join(map(str, route)), params=params)
+        return r.status_code, r.content
+
+    def _head(self, route):
+        self.client.head('/'.join(map(str, route)), timeout=5)
+
+    def _close_transport(self):
+        self.client.close()
+
+    def get_route_json_stream(self, *route, prefix='item', **params):
+        """ See `WyscoutAPILoader.get_route_json_stream`. """
+        if ijson is None:
+            raise ImportError('Streaming responses requires ijson (pip install wyscoutapi[stream])')
+
+        self.rate_limiter.acquire()
+        with self.client.stream('GET', '/'.join(map(str, route)), params=_encode_params(params)) as r:
+            if not 200 <= r.status_code < 300:
+                # Errors are small, so can be read in full
+                self._parse_response(r.status_code, r.read())
+
+            # httpx exposes the body as an iterator of chunks rather than a file,
+            # so feed these to ijson, yielding whichever items each chunk completes
+            items = ijson.sendable_list()
+            parser = ijson.items_coro(items, prefix, use_float=True)
+            for chunk in r.iter_bytes():
+                parser.send(chunk)
+                yield from items
+                del items[:]
+            parser.close()
+            yield from items
+
+
+class AsyncHttpxWyscoutAPILoader(_BaseAsyncWyscoutAPILoader):
+    """
+    An asyncio loader backed by an HTTP/2 httpx client, so that concurrent calls
+    (e.g. with `asyncio.gather`) are multiplexed over a single connection.
+    """
+
+    __slots__ = ('client',)
+
+    def __init__(self, username, password, version='v3', requests_per_sec=12,
+                 cache_size=1024, cache_ttl=300):
+        if httpx is None:
+            raise ImportError(
+                'AsyncHttpxWyscoutAPILoader requires httpx (pip install wyscoutapi[http2])'
+            )
+
+        super().__init__(
+            username=username,
+            version=version,
+            requests_per_sec=requests_per_sec,
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
+        )
+
+        self.client = httpx.AsyncClient(
+            http2=True,
+            base_url=self._url_prefix,
+            headers=_basic_auth_header(username, password),
+        )
+
+    async def _fetch(self, route, params):
+        r = await self.client.get('/'.join(map(str, route)), params=params)
+        return r.status_code, r.content
+
+    async def _close_transport(self):
+        await self.client.aclose()
+
+
+# API Client
+
+_REQUIRED = object()
 
-    def team_matches(self, team_id, details=None, fetch=None):
-        """ Returns the list of matches played by the given team. """
-        return self.loader.get_route_json('teams', team_id, 'matches', details=details, fetch=fetch)
+_Endpoint = collections.namedtuple(
+    '_Endpoint',
+    ['name', 'route', 'params', 'doc', 'details'],
+    defaults=[(), None, True],
+)
+_Endpoint.__doc__ = """
+A declarative description of a single API endpoint.
 
-    def team_fixtures(self, team_id, details=None, fetch=None):
-        """ Retrieves all the fixtures matches for the given team. """
-        return self.loader.get_route_json('teams', team_id, 'fixtures', details=details, fetch=fetch)
+`route` is a tuple of path segments, where '{arg}' segments are filled from the
+method's arguments. `params` is a tuple of (arg, api_name, default) query
+parameters, with _REQUIRED marking positional arguments.
+"""
 
-    def team_squad(self, team_id, season_id=None, details=None, fetch=None):
-        """ Returns the list of players currently playing for the given team. """
-        return self.loader.get_route_json('teams', team_id, 'squad', seasonId=season_id, details=details, fetch=fetch)
+_ENDPOINTS = [
+    # Areas
+    _Endpoint('areas', ('areas',)),
+
+    # Coaches
+    _Endpoint('coach', ('coaches', '{coach_id}'),
+              doc='Retrieves information about a given coach.'),
+
+    # Competitions
+    _Endpoint('competitions', ('competitions',),
+              params=(('area_id', 'areaId', _REQUIRED),),
+              doc='Returns a list of competitions for a given area.'),
+    _Endpoint('competition', ('competitions', '{competition_id}'),
+              doc='Retrieves information about a given competition.'),
+    _Endpoint('competition_seasons', ('competitions', '{competition_id}', 'seasons'),
+              params=(('active', 'active', False),),
+              doc='Returns the list of seasons of the given competition.'),
+    _Endpoint('competition_matches', ('competitions', '{competition_id}', 'matches'),
+              doc='Returns the list of matches of the given competition in the current season.'),
+    _Endpoint('competition_players', ('competitions', '{competition_id}', 'players'),
+              doc='Returns the list of players of the given competition in the current season.'),
+    _Endpoint('competition_teams', ('competitions', '{competition_id}', 'teams'),
+              doc='Returns the list of teams of the given competition in the current season.'),
+
+    # Matches
+    _Endpoint('match', ('matches', '{match_id}'),
+              params=(('use_sides', 'useSides', False),),
+              doc='Retrieves information about a given match.'),
+
+    # Players
+    _Endpoint('player', ('players', '{player_id}'),
+              params=(('image_data_url', 'imageDataURL', False),),
+              doc='Retrieves information about a given player.'),
+    _Endpoint('player_career', ('players', '{player_id}', 'career'),
+              doc='Retrieves aggregated career information about a given player.'),
+    _Endpoint('player_transfer', ('players', '{player_id}', 'transfer'),
+              doc="Retrieves a given player's transfers."),
+    _Endpoint('player_matches', ('players', '{player_id}', 'matches'),
+              doc='Returns the list of matches played by the given player in the current season.'),
+    _Endpoint('player_fixtures', ('players', '{player_id}', 'fixtures'),
+              doc='Retrieves all the fixtures matches for the given player.'),
+
+    # Referees
+    _Endpoint('referee', ('referees', '{referee_id}'),
+              doc='Retrieves informations about a given referee.'),
+
+    # Rounds
+    _Endpoint('round', ('rounds', '{round_id}'),
+              doc='Retrieves information about a given round.'),
+
+    # Search
+    _Endpoint('search', ('search',),
+              params=(('query', 'query', _REQUIRED),
+                      ('object_type', 'objType', _REQUIRED)),
+              doc="""
+              Returns a list of objects, matching the provided search string.
 
-    def team_career(self, team_id, season_id=None, details=None, fetch=None):
-        """ Retrieves all the team's information for the given season. """
-        return self.loader.get_route_json('teams', team_id, 'career', details=details, fetch=fetch)
+              For example:
+              >>> w = WyscoutAPI()
+              >>> w.search('totti', 'player')
+              """),
+
+    # Seasons
+    _Endpoint('season', ('seasons', '{season_id}'),
+              doc='Retrieves information about a given season.'),
+    _Endpoint('season_career', ('seasons', '{season_id}', 'career'),
+              params=(('filters', 'filters', None),),
+              doc="Retrieves all the team's information for the given season."),
+    _Endpoint('season_matches', ('seasons', '{season_id}', 'matches'),
+              doc='Returns the list of matches played in the given season.'),
+    _Endpoint('season_fixtures', ('seasons', '{season_id}', 'fixtures'),
+              doc='Retrieves all the matches for the given season.'),
+    _Endpoint('season_players', ('seasons', '{season_id}', 'players'),
+              doc='Returns the list of players in the given season.'),
+    _Endpoint('season_teams', ('seasons', '{season_id}', 'teams'),
+              doc='Returns the list of teams in the given season.'),
+    _Endpoint('season_standings', ('seasons', '{season_id}', 'standings'),
+              doc="Retrieves all the standing's information for the given season."),
+
+    # Teams
+    _Endpoint('team', ('teams', '{team_id}'),
+              params=(('image_data_url', 'imageDataURL', False),),
+              doc='Retrieves informations about a given team.'),
+    _Endpoint('team_matches', ('teams', '{team_id}', 'matches'),
+              doc='Returns the list of matches played by the given team.'),
+    _Endpoint('team_fixtures', ('teams', '{team_id}', 'fixtures'),
+              doc='Retrieves all the fixtures matches for the given team.'),
+    _Endpoint('team_squad', ('teams', '{team_id}', 'squad'),
+              params=(('season_id', 'seasonId', None),),
+              doc='Returns the list of players currently playing for the given team.'),
+    _Endpoint('team_career', ('teams', '{team_id}', 'career'),
+              params=(('season_id', 'seasonId', None),),
+              doc="Retrieves all the team's information for the given season."),
 
     # Statistics Pack
+    _Endpoint('player_advancedstats', ('players', '{player_id}', 'advancedstats'),
+              params=(('competition_id', 'compId', _REQUIRED),
+                      ('season_id', 'seasonId', None),
+                      ('round_id', 'roundId', None),
+                      ('match_day', 'matchDay', None)),
+              details=False,
+              doc="""
+              Returns advanced statistics of a given player in a specific competition's
+              season. The statistics provided are relative globally to the selected season,
+              not to a specific team.
+              """),
+    _Endpoint('team_advancedstats', ('teams', '{team_id}', 'advancedstats'),
+              params=(('competition_id', 'compId', _REQUIRED),
+                      ('season_id', 'seasonId', None),
+                      ('round_id', 'roundId', None),
+                      ('match_day', 'matchDay', None)),
+              details=False,
+              doc="""
+              Returns advanced statistics of a given team in a specific competition's
+              season. The statistics provided are relative globally to the selected season.
+              """),
+
+    # Events pack
+    _Endpoint('match_events', ('matches', '{match_id}', 'events'),
+              doc="Retrieves informations about a given match's events."),
+
+    # Injuries pack
+    _Endpoint('player_injuries', ('players', '{player_id}', 'injuries'),
+              details=False,
+              doc='BETA: Returns the list of injuries for a given player.'),
+]
+
+
+def _decode_data_url(data_url):
+    """
+    Decode a base64 data URL (as returned with imageDataURL=true) to a view of its
+    bytes. A bare base64 payload (without the 'data:...;base64,' header) is also accepted.
+    """
+    head, sep, payload = (data_url or '').partition(',')
+    if not sep:
+        payload = head
+    if not payload:
+        raise UnknownError('Response did not include image data')
+    return memoryview(base64.b64decode(payload))
+
+
+def _not_none(**params):
+    return {param: val for param, val in params.items() if val is not None}
+
+
+def _endpoint_source(endpoint):
+    """ Generate the source code of the APIClient method for an endpoint. """
+    params = list(endpoint.params)
+    if endpoint.details:
+        params += [('details', 'details', None), ('fetch', 'fetch', None)]
+
+    args = [seg[1:-1] for seg in endpoint.route if seg.startswith('{')]
+    args += [arg for arg, _, default in params if default is _REQUIRED]
+    kwargs = [f'{arg}={default!r}' for arg, _, default in params if default is not _REQUIRED]
+
+    arg_names = args + [arg for arg, _, default in params if default is not _REQUIRED]
+    api_names = [api_name for _, api_name, _ in params]
+    if len(set(arg_names)) != len(arg_names) or len(set(api_names)) != len(api_names):
+        raise ValueError(f'Duplicate parameter in endpoint {endpoint.name!r}')
+    if not all(arg.isidentifier() for arg in arg_names):
+        raise ValueError(f'Invalid argument name in endpoint {endpoint.name!r}')
+
+    # Params defaulting to None are only passed on when they are set, and
+    # skipped entirely (without building a dict) in the common case of none being set
+    optional = [(arg, api_name) for arg, api_name, default in params if default is None]
+    route = [seg[1:-1] if seg.startswith('{') else repr(seg) for seg in endpoint.route]
+    route += [f'{api_name}={arg}' for arg, api_name, default in params if default is not None]
+
+    source = f"def {endpoint.name}({', '.join(['self'] + args + kwargs)}):\n"
+    if optional:
+        source += (
+            f"    if {' and '.join(f'{arg} is None' for arg, _ in optional)}:\n"
+            f"        return self.loader.get_route_json({', '.join(route)})\n"
+        )
+        route.append(f"**_not_none({', '.join(f'{api_name}={arg}' for arg, api_name in optional)})")
+    source += f"    return self.loader.get_route_json({', '.join(route)})\n"
+
+    return source
+
 
-    def player_advancedstats(self, player_id, competition_id, season_id=None,
-                             round_id=None, match_day=None):
+def _with_endpoints(endpoints):
+    """
+    Class decorator adding a method for each endpoint.
+
+    Methods are compiled from source, so that each has a real signature and
+    forwards to the loader with its route and parameter names pre-bound.
+    """
+    def decorator(cls):
+        for endpoint in endpoints:
+            namespace = {'_not_none': _not_none}
+            exec(compile(_endpoint_source(endpoint), f'<wyscoutapi.{endpoint.name}>', 'exec'), namespace)
+            method = namespace[endpoint.name]
+            method.__doc__ = inspect.cleandoc(endpoint.doc) if endpoint.doc else None
+            method.__module__ = cls.__module__
+            method.__qualname__ = f'{cls.__qualname__}.{endpoint.name}'
+            setattr(cls, endpoint.name, method)
+        return cls
+    return decorator
+
+
+@_with_endpoints(_ENDPOINTS)
+class APIClient:
+    """
+    A wrapper for the Wyscout football data API v2 & v3
+
+    Most endpoint methods are generated from `_ENDPOINTS` (see `_with_endpoints`).
+    """
+
+    __slots__ = ('loader',)
+
+    def __init__(self, loader):
+        self.loader = loader
+
+    # Events pack
+
+    def match_events_iter(self, match_id, details=None, fetch=None):
         """
-        Returns advanced statistics of a given player in a specific competition's
-        season. The statistics provided are relative globally to the selected season,
-        not to a specific team.
+        Lazily iterates over a given match's events, without loading the whole
+        response into memory. Requires a loader supporting `get_route_json_stream`
+        (WyscoutAPILoader or HttpxWyscoutAPILoader).
         """
-        return self.loader.get_route_json('players', player_id, 'advancedstats',
-                                          compId=competition_id,
-                                          seasonId=season_id,
-                                          roundId=round_id,
-                                          matchDay=match_day)
-
-    def team_advancedstats(self, team_id, competition_id, season_id=None,
-                             round_id=None, match_day=None):
+        stream = getattr(self.loader, 'get_route_json_stream', None)
+        if stream is None:
+            raise TypeError(
+                f'{type(self.loader).__name__} does not support streaming responses; '
+                'use WyscoutAPILoader or HttpxWyscoutAPILoader'
+            )
+        return stream('matches', match_id, 'events', prefix='events.item',
+                      **_not_none(details=details, fetch=fetch))
+
+    # Images
+
+    def player_image(self, player_id):
         """
-        Returns advanced statistics of a given team in a specific competition's
-        season. The statistics provided are relative globally to the selected season.
+        Retrieves a given player's image, as a memoryview of the image file's bytes
+        (which can be passed to e.g. `PIL.Image.open(io.BytesIO(...))`).
         """
-        return self.loader.get_route_json('teams', team_id, 'advancedstats',
-                                          compId=competition_id,
-                                          seasonId=season_id,
-                                          roundId=round_id,
-                                          matchDay=match_day)
+        content = self.loader.get_route_json('players', player_id, imageDataURL=True)
+        return _decode_data_url(content['imageDataURL'])
 
-    # Events pack
-
-    def match_events(self, match_id, details=None, fetch=None):
-        """ Retrieves informations about a given match's events. """
-        return self.loader.get_route_json('matches', match_id, 'events', details=details, fetch=fetch)
-
-    # Injuries pack
-
-    def player_injuries(self, player_id):
-        """ BETA: Returns the list of injuries for a given player. """
-        return self.loader.get_route_json('players', player_id, 'injuries')
+    def team_image(self, team_id):
+        """ Retrieves a given team's image, as a memoryview of the image file's bytes. """
+        content = self.loader.get_route_json('teams', team_id, imageDataURL=True)
+        return _decode_data_url(content['imageDataURL'])
 
     # Extra
 
@@ -290,16 +966,114 @@ class APIClient:
         """
         return self.loader.get_route_json('updatedobjects', updated_since=timestamp, type=object_type)[object_type]
 
+    # Batching
+
+    def map(self, method_name, ids, max_workers=None, **kwargs):
+        """
+        Calls the method `method_name` for each of `ids` concurrently, returning
+        the results in the same order as `ids`.
+
+        For example:
+        >>> w = WyscoutAPI()
+        >>> w.map('team_squad', [1609, 1610], season_id=186353)
+
+        By default, one worker thread is used per request allowed by the loader's
+        rate limiter each second (the loader's connection pool is sized to match),
+        so that the rate limit is saturated without workers waiting on connections.
+        """
+        if max_workers is None:
+            max_workers = getattr(getattr(self.loader, 'rate_limiter', None), 'capacity', 1)
+
+        method = getattr(self, method_name)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=int(max_workers)) as executor:
+            return list(executor.map(lambda id_: method(id_, **kwargs), ids))
+
+    def players(self, player_ids, **kwargs):
+        """ Retrieves information about each of the given players. """
+        return self.map('player', player_ids, **kwargs)
+
 
 class WyscoutAPI(APIClient):
     """
     Wyscout API Client using the live Wyscout Data API (see https://apidocs.wyscout.com/)
     """
 
-    def __init__(self, username, password, version='v3', requests_per_sec=12):
+    __slots__ = ()
+
+    def __init__(self, username, password, version='v3', requests_per_sec=12, warm=False):
         self.loader = WyscoutAPILoader(
+            username=username,
+            password=password,
+            version=version,
+            requests_per_sec=requests_per_sec,
+            warm=warm,
+        )
+
+    def close(self):
+        self.loader.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class AsyncAPIClient(APIClient):
+    """
+    A wrapper for the Wyscout football data API v2 & v3, for use with an async loader.
+
+    Each method returns an awaitable, so that many calls can be made concurrently:
+    >>> await asyncio.gather(*(client.player(player_id) for player_id in player_ids))
+    """
+
+    __slots__ = ()
+
+    async def updated_objects(self, timestamp, object_type):
+        """ See `APIClient.updated_objects`. """
+        content = await self.loader.get_route_json('updatedobjects', updated_since=timestamp, type=object_type)
+        return content[object_type]
+
+    async def player_image(self, player_id):
+        """ See `APIClient.player_image`. """
+        content = await self.loader.get_route_json('players', player_id, imageDataURL=True)
+        return _decode_data_url(content['imageDataURL'])
+
+    async def team_image(self, team_id):
+        """ See `APIClient.team_image`. """
+        content = await self.loader.get_route_json('teams', team_id, imageDataURL=True)
+        return _decode_data_url(content['imageDataURL'])
+
+    async def map(self, method_name, ids, **kwargs):
+        """ See `APIClient.map`. Calls are made concurrently on the event loop. """
+        method = getattr(self, method_name)
+        return list(await asyncio.gather(*(method(id_, **kwargs) for id_ in ids)))
+
+    async def players(self, player_ids, **kwargs):
+        """ See `APIClient.players`. """
+        return await self.map('player', player_ids, **kwargs)
+
+
+class AsyncWyscoutAPI(AsyncAPIClient):
+    """
+    Async Wyscout API Client using the live Wyscout Data API (see https://apidocs.wyscout.com/)
+    """
+
+    __slots__ = ()
+
+    def __init__(self, username, password, version='v3', requests_per_sec=12):
+        self.loader = AsyncWyscoutAPILoader(
             username=username,
             password=password,
             version=version,
             requests_per_sec=requests_per_sec
         )
+
+    async def close(self):
+        await self.loader.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()